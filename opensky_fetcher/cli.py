@@ -1,23 +1,31 @@
 """CLI for OpenSky Network flight data fetcher."""
 
 import asyncio
-import json
+import functools
+import re
 import sys
-from collections.abc import Callable
-from datetime import date, datetime, timedelta
-from typing import Any
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
 
 import click
-import httpx
-from dotenv import load_dotenv
+import duckdb
 from loguru import logger
-from tqdm import tqdm
 
-from .client import OpenSkyClient
 from .database import FlightDatabase
 
-# Load environment variables from .env file
-load_dotenv()
+# httpx, tqdm and the API client are imported where they are used, so that
+# `--help` and `export` don't pay for loading the HTTP stack
+if TYPE_CHECKING:
+    import httpx
+
+# Airport codes are four letters or digits (ICAO indicators, plus the alphanumeric
+# identifiers OpenSky uses for small airfields)
+_AIRPORT_CODE = re.compile(r"[A-Za-z0-9]{4}")
+
+# Seconds between refreshes of the in-flight count shown next to the progress bar
+ACTIVITY_REFRESH_INTERVAL = 0.5
 
 
 def configure_logging(verbosity: int, quiet: bool) -> None:
@@ -34,6 +42,8 @@ def configure_logging(verbosity: int, quiet: bool) -> None:
     if quiet:
         return
 
+    from tqdm import tqdm
+
     # Map verbosity to log level
     if verbosity == 0:
         # Default mode - show warnings and errors
@@ -74,14 +84,16 @@ def parse_date(date_str: str) -> date | datetime:
     Raises:
         click.ClickException: If the date/datetime format is invalid
     """
-    # Try parsing as date first
-    try:
-        return date.fromisoformat(date_str)
-    except ValueError:
-        pass
+    # Skip the date attempt for the usual datetime separators; anything else that isn't
+    # a plain date (e.g. a lowercase "t") still falls through to the datetime parser
+    if " " not in date_str and "T" not in date_str:
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
 
-    # Try parsing as datetime (handles both formats with/without T)
     try:
+        # Datetime (handles both formats with/without T)
         return datetime.fromisoformat(date_str.replace(" ", "T"))
     except ValueError as e:
         raise click.ClickException(
@@ -90,6 +102,35 @@ def parse_date(date_str: str) -> date | datetime:
         ) from e
 
 
+class DateOrDateTime(click.ParamType):
+    """Click parameter type for the date/datetime formats accepted by parse_date()."""
+
+    name = "date"
+
+    def convert(
+        self, value: Any, param: click.Parameter | None, ctx: click.Context | None
+    ) -> date | datetime:
+        """Convert a command-line value to a date or datetime.
+
+        Args:
+            value: Raw option value (or an already converted date)
+            param: Option being converted
+            ctx: Current Click context
+
+        Returns:
+            Parsed date or datetime object
+        """
+        if isinstance(value, date):
+            return value
+        try:
+            return parse_date(value)
+        except click.ClickException as e:
+            self.fail(e.message, param, ctx)
+
+
+DATE_OR_DATETIME = DateOrDateTime()
+
+
 def parse_and_validate_airports(airports_str: str) -> list[str]:
     """Parse and validate airport codes.
 
@@ -97,29 +138,99 @@ def parse_and_validate_airports(airports_str: str) -> list[str]:
         airports_str: Comma-separated airport codes
 
     Returns:
-        List of valid airport codes (uppercase, 4 characters)
+        List of valid airport codes (uppercase, 4 letters or digits)
     """
     # Split by comma and strip whitespace
-    raw_codes = [code.strip().upper() for code in airports_str.split(",")]
-
-    valid_codes = []
-    for code in raw_codes:
-        # Skip empty strings (from trailing/leading commas)
-        if not code:
-            continue
-
-        # Validate length
-        if len(code) != 4:
-            logger.warning(
-                f"Invalid airport code '{code}' (must be exactly 4 characters) - skipping"
-            )
-            continue
-
-        valid_codes.append(code)
+    raw_codes = [code.strip() for code in airports_str.split(",")]
+
+    # Validate before uppercasing: str.upper() can turn non-ASCII characters into ASCII
+    # letters (e.g. "ß" becomes "SS"). Empty strings (from trailing/leading commas) are
+    # dropped silently.
+    is_valid = _AIRPORT_CODE.fullmatch
+    valid_codes = [code.upper() for code in raw_codes if is_valid(code)]
+    invalid_codes = [code for code in raw_codes if code and not is_valid(code)]
+
+    if invalid_codes:
+        plural = "s" if len(invalid_codes) > 1 else ""
+        codes = ", ".join(repr(code) for code in invalid_codes)
+        logger.warning(
+            f"Invalid airport code{plural} {codes} (must be exactly 4 letters or digits) - skipping"
+        )
 
     return valid_codes
 
 
+def _run_async(main: Coroutine[Any, Any, None]) -> None:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    uvloop is an optional speedup (``opensky-fetcher[speed]``); the stock asyncio
+    event loop is used when it is unavailable, e.g. on Windows.
+
+    Args:
+        main: Coroutine to run
+    """
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main)
+    else:
+        uvloop.run(main)
+
+
+def _open_database(
+    db_path: str,
+    bulk_mode: bool = False,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+) -> FlightDatabase:
+    """Open the flight database, reporting failures as CLI errors.
+
+    Args:
+        db_path: Path to DuckDB database file
+        bulk_mode: Defer secondary indexes (see FlightDatabase)
+        threads: Number of DuckDB worker threads
+        memory_limit: DuckDB memory limit
+
+    Returns:
+        Opened database
+
+    Raises:
+        click.ClickException: If DuckDB rejects a setting or can't open the file
+    """
+    try:
+        return FlightDatabase(
+            db_path, bulk_mode=bulk_mode, threads=threads, memory_limit=memory_limit
+        )
+    except duckdb.Error as e:
+        raise click.ClickException(f"Could not open database '{db_path}': {e}") from e
+
+
+def _make_http_client(max_concurrent: int) -> "httpx.AsyncClient":
+    """Create the shared HTTP client used for a fetch run.
+
+    The connection pool is sized from max_concurrent so that keepalive connections
+    are reused across all tasks instead of paying a TCP+TLS handshake per request.
+    No transport is passed, so proxies from the environment still apply; failed
+    connections and HTTP error responses are retried by OpenSkyClient.
+
+    Args:
+        max_concurrent: Maximum number of concurrent requests
+
+    Returns:
+        Configured HTTP client (use as an async context manager)
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=max(100, max_concurrent * 4),
+            max_keepalive_connections=max(20, max_concurrent * 2),
+        ),
+        timeout=httpx.Timeout(30.0, connect=10.0),
+    )
+
+
 def generate_date_range(start_date: date | datetime, end_date: date | datetime) -> list[date]:
     """Generate list of dates in a range (inclusive).
 
@@ -136,12 +247,8 @@ def generate_date_range(start_date: date | datetime, end_date: date | datetime)
     start = start_date.date() if isinstance(start_date, datetime) else start_date
     end = end_date.date() if isinstance(end_date, datetime) else end_date
 
-    dates = []
-    current = start
-    while current <= end:
-        dates.append(current)
-        current += timedelta(days=1)
-    return dates
+    # Walk day ordinals rather than adding a timedelta per day
+    return list(map(date.fromordinal, range(start.toordinal(), end.toordinal() + 1)))
 
 
 async def fetch_flights_async(
@@ -156,6 +263,8 @@ async def fetch_flights_async(
     skip_existing: bool,
     quiet: bool,
     flight_type: str = "departure",
+    db_threads: int | None = None,
+    db_memory_limit: str | None = None,
 ) -> None:
     """Async function to fetch flight data.
 
@@ -171,9 +280,17 @@ async def fetch_flights_async(
         skip_existing: Skip dates that already exist in database
         quiet: Suppress all output except progress bar (if interactive)
         flight_type: Type of flights to fetch ("departure" or "destination")
+        db_threads: Number of DuckDB worker threads (default: one per CPU core)
+        db_memory_limit: DuckDB memory limit such as "4GB" (default: 80% of system memory)
     """
-    # Initialize database
-    db = FlightDatabase(db_path)
+    import httpx
+    from tqdm import tqdm
+
+    from .client import OpenSkyClient
+
+    # Initialize database. Secondary indexes are only created at the end of the run, so
+    # a fresh database doesn't maintain them during the load (existing ones are kept).
+    db = _open_database(db_path, bulk_mode=True, threads=db_threads, memory_limit=db_memory_limit)
 
     # Initialize API client
     client = OpenSkyClient(
@@ -186,23 +303,32 @@ async def fetch_flights_async(
     # Generate date range
     dates = generate_date_range(start_date, end_date)
 
-    # Extract start/end dates for comparison
-    first_date = dates[0] if dates else None
-    last_date = dates[-1] if dates else None
-
-    # Create list of tasks (airport, date) pairs
-    tasks = []
-    skipped = 0
-    for airport in airports:
-        for flight_date in dates:
-            if skip_existing and db.has_data(airport, flight_date, flight_type):
-                skipped += 1
-                logger.debug(f"Skipping {airport} {flight_date} (already exists)")
-                continue
-            tasks.append((airport, flight_date))
-
-    # Calculate totals
-    total_requests = skipped + len(tasks)
+    # Precompute begin/end timestamps for every date. Only the first and last dates
+    # can be narrowed, and only when the range was given as datetimes.
+    timestamps = {
+        flight_date: OpenSkyClient.date_to_timestamps(flight_date) for flight_date in dates
+    }
+    if dates and isinstance(start_date, datetime):
+        first_date = dates[0]
+        begin_ts, _ = OpenSkyClient.date_to_timestamps(first_date, time_override=start_date)
+        timestamps[first_date] = (begin_ts, timestamps[first_date][1])
+    if dates and isinstance(end_date, datetime):
+        last_date = dates[-1]
+        _, end_ts = OpenSkyClient.date_to_timestamps(last_date, time_override=end_date)
+        timestamps[last_date] = (timestamps[last_date][0], end_ts)
+
+    # Look up everything already stored for this range with a single query
+    existing: set[tuple[str, date]] = set()
+    if skip_existing and dates:
+        existing = db.existing_keys(flight_type, airports, dates[0], dates[-1])
+
+    # Work out the (airport, date) pairs to fetch with set algebra, sorted so the
+    # fetch order is deterministic
+    all_keys = {(airport, flight_date) for airport in airports for flight_date in dates}
+    to_fetch = all_keys - existing
+    tasks = sorted(to_fetch)
+    skipped = len(all_keys) - len(to_fetch)
+    total_requests = len(all_keys)
 
     # Show summary of what will be fetched
     if skipped > 0:
@@ -228,8 +354,101 @@ async def fetch_flights_async(
             f"Max concurrent: {max_concurrent}"
         )
 
-    # Track concurrent requests
-    current_concurrent = 0
+    # Finished fetches are reported through this queue and drained by a single
+    # progress task, so workers never touch the progress bar themselves
+    done_queue: asyncio.Queue[None] = asyncio.Queue()
+
+    async def report_progress() -> None:
+        """Advance the progress bar as fetches complete."""
+        completed = 0
+        while completed < len(tasks):
+            await done_queue.get()
+            finished = 1
+            # Fold everything else that finished meanwhile into one update
+            while not done_queue.empty():
+                done_queue.get_nowait()
+                finished += 1
+            pbar.update(finished)
+            completed += finished
+
+    # Results written since the last commit, replayed if the open batch has to be
+    # rolled back so one bad result doesn't throw away already-fetched responses
+    pending: list[tuple[str, date, str]] = []
+
+    def replay_pending() -> None:
+        """Start a new batch holding the pending results.
+
+        A result that fails again is dropped and the replay restarts without it.
+        """
+        while True:
+            db.rollback()
+            db.begin()
+            for index, (airport, flight_date, raw_json) in enumerate(pending):
+                try:
+                    db.insert_fetch_result(airport, flight_date, flight_type, raw_json)
+                except Exception as e:
+                    logger.error(f"Database error for {airport} {flight_date}: {e}")
+                    del pending[index]
+                    break
+            else:
+                return
+
+    def store_result(airport: str, flight_date: date, raw_json: str) -> int:
+        """Write a fetch result, committing whenever the open batch is full.
+
+        Runs on the database thread, never on the event loop.
+
+        Args:
+            airport: ICAO airport code
+            flight_date: Date the flights were fetched for
+            raw_json: Raw JSON response body, stored as received
+
+        Returns:
+            Number of flights stored
+
+        Raises:
+            Exception: Re-raises any database error once the rest of the batch is restored
+        """
+        try:
+            flight_count = db.insert_fetch_result(airport, flight_date, flight_type, raw_json)
+        except Exception:
+            # A failed statement aborts the whole open transaction in DuckDB, so roll
+            # back and write the batch's other results again
+            replay_pending()
+            raise
+
+        pending.append((airport, flight_date, raw_json))
+        db.maybe_commit()
+        if db.uncommitted_count == 0:
+            pending.clear()
+        return flight_count
+
+    # All DuckDB work is pinned to one dedicated thread; fetchers hand their results
+    # to a single writer task through a bounded queue and never wait on inserts
+    loop = asyncio.get_running_loop()
+    db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="duckdb-writer")
+    # Items are (airport, date, raw JSON, flight count); None marks the end of work
+    write_queue: asyncio.Queue[tuple[str, date, str] | None]
+    write_queue = asyncio.Queue(maxsize=max_concurrent * 2)
+
+    async def writer() -> None:
+        """Store queued fetch results until the end-of-work sentinel arrives."""
+        while (item := await write_queue.get()) is not None:
+            airport, flight_date, raw_json = item
+            try:
+                flight_count = await loop.run_in_executor(
+                    db_executor, store_result, airport, flight_date, raw_json
+                )
+            except Exception as e:
+                logger.error(f"Database error for {airport} {flight_date}: {e}")
+                continue
+            logger.info(f"Fetched {airport} {flight_date}: {flight_count} flights")
+
+    # API call for the requested flight type
+    if flight_type == "departure":
+        fetch = client.get_departures_json
+    else:  # destination
+        fetch = client.get_destinations_json
 
     async def fetch_single(
         http_client: httpx.AsyncClient,
@@ -243,90 +462,158 @@ async def fetch_flights_async(
             airport: ICAO airport code
             flight_date: Date to fetch flights for
         """
-        nonlocal current_concurrent
-
         try:
-            # Increment concurrent counter
-            current_concurrent += 1
-            pbar.set_postfix_str(f"Active: {current_concurrent}/{max_concurrent}")
-
             logger.debug(f"Starting fetch for {airport} {flight_date}")
 
-            # Convert date to timestamps
-            # Use datetime override for first/last dates if original input was datetime
-            if flight_date == first_date and isinstance(start_date, datetime):
-                # First date: use start_date's time for begin
-                begin_ts, _ = OpenSkyClient.date_to_timestamps(
-                    flight_date, time_override=start_date
-                )
-                if flight_date == last_date and isinstance(end_date, datetime):
-                    # Same day range: use end_date's time for end
-                    _, end_ts = OpenSkyClient.date_to_timestamps(
-                        flight_date, time_override=end_date
-                    )
-                else:
-                    # Multi-day range: use end of day
-                    _, end_ts = OpenSkyClient.date_to_timestamps(flight_date)
-            elif flight_date == last_date and isinstance(end_date, datetime):
-                # Last date: use end_date's time for end
-                begin_ts, _ = OpenSkyClient.date_to_timestamps(flight_date)
-                _, end_ts = OpenSkyClient.date_to_timestamps(flight_date, time_override=end_date)
-            else:
-                # Middle date or no datetime override: use full day
-                begin_ts, end_ts = OpenSkyClient.date_to_timestamps(flight_date)
-
-            # Fetch flights based on type
-            if flight_type == "departure":
-                flights = await client.get_departures(
-                    http_client,
-                    airport,
-                    begin_ts,
-                    end_ts,
-                )
-            else:  # destination
-                flights = await client.get_destinations(
-                    http_client,
-                    airport,
-                    begin_ts,
-                    end_ts,
-                )
-
-            # Store raw response
-            raw_json = json.dumps(flights)
-            db.insert_raw_response(airport, flight_date, flight_type, raw_json)
-
-            # Store parsed flights
-            db.insert_flights(airport, flight_date, flight_type, flights)
-
-            # Commit after each successful fetch
-            db.commit()
-
-            logger.info(f"Fetched {airport} {flight_date}: {len(flights)} flights")
+            begin_ts, end_ts = timestamps[flight_date]
+            # The body goes to DuckDB unparsed; the insert reports how many flights it held
+            raw_json = await fetch(http_client, airport, begin_ts, end_ts)
+            await write_queue.put((airport, flight_date, raw_json))
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching {airport} {flight_date}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error for {airport} {flight_date}: {e}")
         finally:
-            # Decrement concurrent counter and update progress
-            current_concurrent -= 1
-            pbar.set_postfix_str(f"Active: {current_concurrent}/{max_concurrent}")
-            pbar.update(1)
+            done_queue.put_nowait(None)
 
-    async with httpx.AsyncClient(timeout=30.0) as http_client:
-        # Create all coroutines
-        coroutines = [
-            fetch_single(http_client, airport, flight_date) for airport, flight_date in tasks
-        ]
+    # Queue all work up front; a fixed pool of workers drains it so that at most
+    # max_concurrent fetches are ever in flight
+    queue: asyncio.Queue[tuple[str, date]] = asyncio.Queue()
+    for task in tasks:
+        queue.put_nowait(task)
 
-        # Run all tasks concurrently
-        await asyncio.gather(*coroutines)
+    async def worker(http_client: httpx.AsyncClient) -> None:
+        """Fetch queued airport/date combinations until the queue is empty.
 
+        Args:
+            http_client: HTTP client instance
+        """
+        while not queue.empty():
+            airport, flight_date = queue.get_nowait()
+            await fetch_single(http_client, airport, flight_date)
+
+    async def show_activity() -> None:
+        """Periodically show how many fetches are in flight next to the progress bar."""
+        while True:
+            await asyncio.sleep(ACTIVITY_REFRESH_INTERVAL)
+            # Taken off the queue but not yet reported as done
+            active = len(tasks) - queue.qsize() - pbar.n
+            pbar.set_postfix_str(f"Active: {active}/{max_concurrent}")
+
+    async def fetch_all(http_client: httpx.AsyncClient) -> None:
+        """Run the worker pool, then tell the writer no more results are coming.
+
+        Args:
+            http_client: HTTP client instance
+        """
+        workers = [worker(http_client) for _ in range(min(max_concurrent, len(tasks)))]
+        await asyncio.gather(*workers)
+        await write_queue.put(None)
+
+    db.begin()
+    activity = asyncio.create_task(show_activity()) if show_progress else None
+    try:
+        async with _make_http_client(max_concurrent) as http_client:
+            await asyncio.gather(report_progress(), writer(), fetch_all(http_client))
+    finally:
+        if activity is not None:
+            activity.cancel()
+
+        # Commit whatever was fetched, even if the run was interrupted. This goes through
+        # the database thread so it can't overlap an insert that is still running there.
+        await loop.run_in_executor(db_executor, functools.partial(db.maybe_commit, force=True))
+        db_executor.shutdown()
+
+    db.finalize_indexes()
+    db.checkpoint()
     pbar.close()
     db.close()
     logger.info("Done!")
 
 
+# Options shared by the flight subcommands, built once at import
+_COMMON_FLIGHT_OPTIONS = [
+    click.option(
+        "--airports",
+        "-a",
+        required=True,
+        help="Comma-separated list of ICAO airport codes (e.g., KMCO,KJFK,KLAX)",
+    ),
+    click.option(
+        "--start-date",
+        "-s",
+        required=True,
+        type=DATE_OR_DATETIME,
+        help="Start date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
+    ),
+    click.option(
+        "--end-date",
+        "-e",
+        required=True,
+        type=DATE_OR_DATETIME,
+        help="End date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
+    ),
+    click.option(
+        "--db-path",
+        "-d",
+        default="flights.duckdb",
+        help="Path to DuckDB database file (default: flights.duckdb)",
+    ),
+    click.option(
+        "--db-threads",
+        type=click.IntRange(min=1),
+        help="Number of DuckDB worker threads (default: one per CPU core)",
+    ),
+    click.option(
+        "--db-memory-limit",
+        help="DuckDB memory limit, e.g. 4GB (default: 80% of system memory)",
+    ),
+    click.option(
+        "--client-id",
+        envvar="OPENSKY_CLIENT_ID",
+        help="OAuth client ID (or set OPENSKY_CLIENT_ID env var)",
+    ),
+    click.option(
+        "--client-secret",
+        envvar="OPENSKY_CLIENT_SECRET",
+        help="OAuth client secret (or set OPENSKY_CLIENT_SECRET env var)",
+    ),
+    click.option(
+        "--max-concurrent",
+        "-c",
+        default=5,
+        type=int,
+        help="Maximum concurrent requests (default: 5)",
+    ),
+    click.option(
+        "--rate-limit-delay",
+        "-r",
+        default=0.5,
+        type=float,
+        help="Minimum delay between requests in seconds (default: 0.5)",
+    ),
+    click.option(
+        "--no-skip-existing",
+        is_flag=True,
+        help="Re-fetch data even if it already exists in database",
+    ),
+    click.option(
+        "--verbose",
+        "-v",
+        count=True,
+        help="Increase verbosity (use -v for info, -vv for debug). "
+        "Default shows warnings and errors.",
+    ),
+    click.option(
+        "--quiet",
+        "-q",
+        is_flag=True,
+        help="Suppress all output except progress bar (only shown if terminal is interactive).",
+    ),
+]
+
+
 def common_flight_options(f: Callable[..., Any]) -> Callable[..., Any]:
     """Decorator to add common options to flight subcommands.
 
@@ -336,83 +623,16 @@ def common_flight_options(f: Callable[..., Any]) -> Callable[..., Any]:
     Returns:
         Decorated function with common flight options
     """
-    decorators = [
-        click.option(
-            "--airports",
-            "-a",
-            required=True,
-            help="Comma-separated list of ICAO airport codes (e.g., KMCO,KJFK,KLAX)",
-        ),
-        click.option(
-            "--start-date",
-            "-s",
-            required=True,
-            help="Start date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
-        ),
-        click.option(
-            "--end-date",
-            "-e",
-            required=True,
-            help="End date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
-        ),
-        click.option(
-            "--db-path",
-            "-d",
-            default="flights.duckdb",
-            help="Path to DuckDB database file (default: flights.duckdb)",
-        ),
-        click.option(
-            "--client-id",
-            envvar="OPENSKY_CLIENT_ID",
-            help="OAuth client ID (or set OPENSKY_CLIENT_ID env var)",
-        ),
-        click.option(
-            "--client-secret",
-            envvar="OPENSKY_CLIENT_SECRET",
-            help="OAuth client secret (or set OPENSKY_CLIENT_SECRET env var)",
-        ),
-        click.option(
-            "--max-concurrent",
-            "-c",
-            default=5,
-            type=int,
-            help="Maximum concurrent requests (default: 5)",
-        ),
-        click.option(
-            "--rate-limit-delay",
-            "-r",
-            default=0.5,
-            type=float,
-            help="Minimum delay between requests in seconds (default: 0.5)",
-        ),
-        click.option(
-            "--no-skip-existing",
-            is_flag=True,
-            help="Re-fetch data even if it already exists in database",
-        ),
-        click.option(
-            "--verbose",
-            "-v",
-            count=True,
-            help="Increase verbosity (use -v for info, -vv for debug). "
-            "Default shows warnings and errors.",
-        ),
-        click.option(
-            "--quiet",
-            "-q",
-            is_flag=True,
-            help="Suppress all output except progress bar (only shown if terminal is interactive).",
-        ),
-    ]
-    for decorator in reversed(decorators):
-        f = decorator(f)
-    return f
+    return functools.reduce(lambda func, option: option(func), reversed(_COMMON_FLIGHT_OPTIONS), f)
 
 
 @click.group()
 def cli() -> None:
     """OpenSky Network flight data fetcher and exporter."""
-    pass
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file before any subcommand reads them
+    load_dotenv()
 
 
 @cli.group()
@@ -425,9 +645,11 @@ def flights() -> None:
 @common_flight_options
 def departure(
     airports: str,
-    start_date: str,
-    end_date: str,
+    start_date: date | datetime,
+    end_date: date | datetime,
     db_path: str,
+    db_threads: int | None,
+    db_memory_limit: str | None,
     client_id: str | None,
     client_secret: str | None,
     max_concurrent: int,
@@ -440,9 +662,11 @@ def departure(
 
     Args:
         airports: Comma-separated list of ICAO airport codes
-        start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format
+        start_date: Start date or datetime
+        end_date: End date or datetime
         db_path: Path to DuckDB database file
+        db_threads: Number of DuckDB worker threads
+        db_memory_limit: DuckDB memory limit
         client_id: OAuth client ID
         client_secret: OAuth client secret
         max_concurrent: Maximum number of concurrent requests
@@ -463,6 +687,8 @@ def departure(
         start_date,
         end_date,
         db_path,
+        db_threads,
+        db_memory_limit,
         client_id,
         client_secret,
         max_concurrent,
@@ -478,9 +704,11 @@ def departure(
 @common_flight_options
 def destination(
     airports: str,
-    start_date: str,
-    end_date: str,
+    start_date: date | datetime,
+    end_date: date | datetime,
     db_path: str,
+    db_threads: int | None,
+    db_memory_limit: str | None,
     client_id: str | None,
     client_secret: str | None,
     max_concurrent: int,
@@ -493,9 +721,11 @@ def destination(
 
     Args:
         airports: Comma-separated list of ICAO airport codes (destination airports)
-        start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format
+        start_date: Start date or datetime
+        end_date: End date or datetime
         db_path: Path to DuckDB database file
+        db_threads: Number of DuckDB worker threads
+        db_memory_limit: DuckDB memory limit
         client_id: OAuth client ID
         client_secret: OAuth client secret
         max_concurrent: Maximum number of concurrent requests
@@ -516,6 +746,8 @@ def destination(
         start_date,
         end_date,
         db_path,
+        db_threads,
+        db_memory_limit,
         client_id,
         client_secret,
         max_concurrent,
@@ -529,9 +761,11 @@ def destination(
 
 def _fetch_flights_command(
     airports: str,
-    start_date: str,
-    end_date: str,
+    start_date: date | datetime,
+    end_date: date | datetime,
     db_path: str,
+    db_threads: int | None,
+    db_memory_limit: str | None,
     client_id: str | None,
     client_secret: str | None,
     max_concurrent: int,
@@ -545,9 +779,11 @@ def _fetch_flights_command(
 
     Args:
         airports: Comma-separated list of ICAO airport codes
-        start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format
+        start_date: Start date or datetime
+        end_date: End date or datetime
         db_path: Path to DuckDB database file
+        db_threads: Number of DuckDB worker threads
+        db_memory_limit: DuckDB memory limit
         client_id: OAuth client ID
         client_secret: OAuth client secret
         max_concurrent: Maximum number of concurrent requests
@@ -575,24 +811,22 @@ def _fetch_flights_command(
     airport_list = parse_and_validate_airports(airports)
     if not airport_list:
         raise click.ClickException(
-            "No valid airport codes provided. Airport codes must be exactly 4 characters."
+            "No valid airport codes provided. Airport codes must be exactly 4 letters or digits."
         )
 
-    # Parse dates
-    start = parse_date(start_date)
-    end = parse_date(end_date)
-
     # Validate date range
-    if start > end:
+    if start_date > end_date:
         raise click.ClickException("Start date must be before or equal to end date")
 
     # Run async fetch
-    asyncio.run(
+    _run_async(
         fetch_flights_async(
             airports=airport_list,
-            start_date=start,
-            end_date=end,
+            start_date=start_date,
+            end_date=end_date,
             db_path=db_path,
+            db_threads=db_threads,
+            db_memory_limit=db_memory_limit,
             client_id=client_id,
             client_secret=client_secret,
             max_concurrent=max_concurrent,
@@ -612,6 +846,15 @@ def _fetch_flights_command(
     default="flights.duckdb",
     help="Path to DuckDB database file (default: flights.duckdb)",
 )
+@click.option(
+    "--db-threads",
+    type=click.IntRange(min=1),
+    help="Number of DuckDB worker threads (default: one per CPU core)",
+)
+@click.option(
+    "--db-memory-limit",
+    help="DuckDB memory limit, e.g. 4GB (default: 80% of system memory)",
+)
 @click.option(
     "--format",
     "-f",
@@ -619,6 +862,11 @@ def _fetch_flights_command(
     default="csv",
     help="Output format: csv or parquet (default: csv)",
 )
+@click.option(
+    "--partitioned",
+    is_flag=True,
+    help="Write Parquet as a directory partitioned by airport and date.",
+)
 @click.option(
     "--departure-airports",
     "--from",
@@ -632,11 +880,13 @@ def _fetch_flights_command(
 @click.option(
     "--start-date",
     "-s",
+    type=DATE_OR_DATETIME,
     help="Filter by start date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
 )
 @click.option(
     "--end-date",
     "-e",
+    type=DATE_OR_DATETIME,
     help="Filter by end date/datetime (YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')",
 )
 @click.option(
@@ -654,11 +904,14 @@ def _fetch_flights_command(
 def export(
     output_file: str,
     db_path: str,
+    db_threads: int | None,
+    db_memory_limit: str | None,
     format: str,
+    partitioned: bool,
     departure_airports: str | None,
     arrival_airports: str | None,
-    start_date: str | None,
-    end_date: str | None,
+    start_date: date | datetime | None,
+    end_date: date | datetime | None,
     verbose: int,
     quiet: bool,
 ) -> None:
@@ -667,7 +920,10 @@ def export(
     Args:
         output_file: Path to output file
         db_path: Path to DuckDB database file
+        db_threads: Number of DuckDB worker threads
+        db_memory_limit: DuckDB memory limit
         format: Output format (csv or parquet)
+        partitioned: Write Parquet as a Hive-partitioned directory by airport and date
         departure_airports: Filter by departure airport codes
         arrival_airports: Filter by arrival airport codes
         start_date: Filter by start date
@@ -681,6 +937,7 @@ def export(
     Examples:
         opensky-fetch export flights.csv --format csv --from KMCO --to KLAX
         opensky-fetch export flights.parquet -f parquet -s 2024-01-01 -e 2024-01-31
+        opensky-fetch export flights/ -f parquet --partitioned
         opensky-fetch export morning.csv -s "2024-01-01 06:00:00" -e "2024-01-01 12:00:00"
     """
     # Configure logging
@@ -692,6 +949,9 @@ def export(
     if not Path(db_path).exists():
         raise click.ClickException(f"Database file '{db_path}' does not exist")
 
+    if partitioned and format.lower() != "parquet":
+        raise click.ClickException("--partitioned requires --format parquet")
+
     # Parse optional filters
     departure_list = None
     if departure_airports:
@@ -699,7 +959,7 @@ def export(
         if not departure_list:
             raise click.ClickException(
                 "No valid departure airport codes provided. "
-                "Airport codes must be exactly 4 characters."
+                "Airport codes must be exactly 4 letters or digits."
             )
 
     arrival_list = None
@@ -708,23 +968,15 @@ def export(
         if not arrival_list:
             raise click.ClickException(
                 "No valid arrival airport codes provided. "
-                "Airport codes must be exactly 4 characters."
+                "Airport codes must be exactly 4 letters or digits."
             )
 
-    start = None
-    if start_date:
-        start = parse_date(start_date)
-
-    end = None
-    if end_date:
-        end = parse_date(end_date)
-
     # Validate date range if both provided
-    if start and end and start > end:
+    if start_date and end_date and start_date > end_date:
         raise click.ClickException("Start date must be before or equal to end date")
 
     # Open database and export
-    db = FlightDatabase(db_path)
+    db = _open_database(db_path, threads=db_threads, memory_limit=db_memory_limit)
 
     try:
         logger.info(f"Exporting to {output_file} ({format.upper()})...")
@@ -734,16 +986,17 @@ def export(
                 output_file,
                 departure_airports=departure_list,
                 arrival_airports=arrival_list,
-                start_date=start,
-                end_date=end,
+                start_date=start_date,
+                end_date=end_date,
             )
         else:  # parquet
             row_count = db.export_to_parquet(
                 output_file,
                 departure_airports=departure_list,
                 arrival_airports=arrival_list,
-                start_date=start,
-                end_date=end,
+                start_date=start_date,
+                end_date=end_date,
+                partitioned=partitioned,
             )
 
         logger.info(f"Exported {row_count:,} rows to {output_file}")
@@ -1,12 +1,53 @@
 """OpenSky Network API client with OAuth and rate limiting."""
 
 import asyncio
+import random
+import time
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 import httpx
 from loguru import logger
 
+# orjson (the optional `speed` extra) parses responses several times faster than json
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Retry policy for transient API failures (rate limiting and server errors)
+MAX_RETRIES = 5
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Failed connection attempts are retried a few times with a short backoff
+CONNECT_RETRIES = 3
+CONNECT_RETRY_BASE_DELAY = 0.5
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """Compute how long to wait before retrying a failed request.
+
+    Honors a numeric Retry-After header, otherwise backs off exponentially with jitter.
+
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        response: Failed HTTP response
+
+    Returns:
+        Delay in seconds
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # HTTP-date form; fall back to exponential backoff
+
+    backoff = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+    return backoff + random.uniform(0, 0.5)  # noqa: S311 - jitter, not cryptographic
+
 
 class OpenSkyClient:
     """Async HTTP client for OpenSky Network API with rate limiting.
@@ -37,8 +78,11 @@ class OpenSkyClient:
 
         self._token: str | None = None
         self._token_expires: datetime | None = None
+        # Single-flight guard so concurrent callers share one token refresh
+        self._token_lock = asyncio.Lock()
         self._semaphore = asyncio.Semaphore(max_concurrent)
-        self._last_request_time: float | None = None
+        # Monotonic time at which the next request may start
+        self._next_request_time = 0.0
 
     async def _get_token(self, client: httpx.AsyncClient) -> str:
         """Get or refresh OAuth access token.
@@ -50,11 +94,38 @@ class OpenSkyClient:
             Access token string
         """
         # Return cached token if still valid
+        token = self._cached_token()
+        if token is not None:
+            return token
+
+        async with self._token_lock:
+            # Another caller may have refreshed the token while we waited for the lock
+            token = self._cached_token()
+            if token is not None:
+                return token
+            return await self._refresh_token(client)
+
+    def _cached_token(self) -> str | None:
+        """Get the cached OAuth token if it is not about to expire.
+
+        Returns:
+            Access token string, or None if a new token is needed
+        """
         if self._token and self._token_expires:
             if datetime.now() < self._token_expires - timedelta(minutes=5):
                 logger.debug("Using cached OAuth token")
                 return self._token
+        return None
+
+    async def _refresh_token(self, client: httpx.AsyncClient) -> str:
+        """Request a new OAuth access token and cache it.
+
+        Args:
+            client: HTTP client instance
 
+        Returns:
+            Access token string
+        """
         # Request new token
         logger.debug("Requesting new OAuth token")
         response = await client.post(
@@ -78,12 +149,33 @@ class OpenSkyClient:
 
         return access_token
 
+    def _reserve_request_slot(self) -> float:
+        """Reserve the next request start time allowed by the rate limit.
+
+        Each caller claims its own slot, rate_limit_delay after the previous one, so
+        concurrent requests are spaced out without serializing on a lock while they wait.
+
+        Returns:
+            Seconds to wait before starting the request
+        """
+        now = time.monotonic()
+        start = max(now, self._next_request_time)
+        self._next_request_time = start + self.rate_limit_delay
+        return start - now
+
     async def _rate_limited_request(
         self,
         client: httpx.AsyncClient,
         url: str,
     ) -> httpx.Response:
-        """Make a rate-limited HTTP request.
+        """Make a rate-limited HTTP request, retrying transient failures.
+
+        Rate limiting (429) and server errors are retried up to MAX_RETRIES times,
+        honoring Retry-After or backing off exponentially; failed connection attempts
+        (including the token request) are retried up to CONNECT_RETRIES times. Each
+        retry takes a new rate limit slot, and no concurrency slot is held while
+        backing off. Other error statuses, or a retryable one once retries run out,
+        surface as the httpx.HTTPStatusError from raise_for_status().
 
         Args:
             client: HTTP client instance
@@ -91,40 +183,64 @@ class OpenSkyClient:
 
         Returns:
             HTTP response
+
+        Raises:
+            httpx.ConnectError: If connecting still fails once retries run out
+            httpx.ConnectTimeout: If connecting still times out once retries run out
         """
-        async with self._semaphore:
-            # Implement rate limiting
-            if self._last_request_time is not None:
-                elapsed = asyncio.get_event_loop().time() - self._last_request_time
-                if elapsed < self.rate_limit_delay:
-                    sleep_time = self.rate_limit_delay - elapsed
-                    logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-                    await asyncio.sleep(sleep_time)
-
-            # Get current token
-            token = await self._get_token(client)
-
-            # Make request
-            logger.debug(f"Making request to {url}")
-            response = await client.get(
-                url,
-                headers={"Authorization": f"Bearer {token}"},
+        attempt = 0
+        connect_attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    # Implement rate limiting
+                    sleep_time = self._reserve_request_slot()
+                    if sleep_time > 0:
+                        logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
+                        await asyncio.sleep(sleep_time)
+
+                    # Get current token
+                    token = await self._get_token(client)
+
+                    # Make request
+                    logger.debug(f"Making request to {url}")
+                    response = await client.get(
+                        url,
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if connect_attempt >= CONNECT_RETRIES:
+                    raise
+                delay = CONNECT_RETRY_BASE_DELAY * 2**connect_attempt
+                connect_attempt += 1
+                logger.warning(
+                    f"Connection failed for {url} ({type(e).__name__}), "
+                    f"retrying in {delay:.1f}s ({connect_attempt}/{CONNECT_RETRIES})"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            status = response.status_code
+            if status not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                response.raise_for_status()
+                logger.debug(f"Request completed with status {status}")
+                return response
+
+            delay = _retry_delay(attempt, response)
+            attempt += 1
+            logger.warning(
+                f"HTTP {status} for {url}, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})"
             )
+            await asyncio.sleep(delay)
 
-            self._last_request_time = asyncio.get_event_loop().time()
-            response.raise_for_status()
-            logger.debug(f"Request completed with status {response.status_code}")
-
-            return response
-
-    async def get_departures(
+    async def get_departures_json(
         self,
         client: httpx.AsyncClient,
         airport: str,
         begin: int,
         end: int,
-    ) -> list[dict[str, Any]]:
-        """Get departure flights for an airport in a time range.
+    ) -> str:
+        """Get the raw JSON response for departure flights from an airport in a time range.
 
         Args:
             client: HTTP client instance
@@ -133,25 +249,23 @@ class OpenSkyClient:
             end: End timestamp (Unix epoch)
 
         Returns:
-            List of flight dictionaries
+            Raw JSON response body (an array of flight objects)
         """
         url = f"{self.API_BASE}/flights/departure"
         params = f"?airport={airport}&begin={begin}&end={end}"
 
         logger.debug(f"Fetching departures for {airport} (begin={begin}, end={end})")
         response = await self._rate_limited_request(client, url + params)
-        data = response.json()
-        logger.debug(f"Retrieved {len(data)} departure flights for {airport}")
-        return data
+        return response.text
 
-    async def get_destinations(
+    async def get_destinations_json(
         self,
         client: httpx.AsyncClient,
         airport: str,
         begin: int,
         end: int,
-    ) -> list[dict[str, Any]]:
-        """Get destination/arrival flights for an airport in a time range.
+    ) -> str:
+        """Get the raw JSON response for flights arriving at an airport in a time range.
 
         Args:
             client: HTTP client instance
@@ -160,16 +274,60 @@ class OpenSkyClient:
             end: End timestamp (Unix epoch)
 
         Returns:
-            List of flight dictionaries
+            Raw JSON response body (an array of flight objects)
         """
         url = f"{self.API_BASE}/flights/arrival"
         params = f"?airport={airport}&begin={begin}&end={end}"
 
         logger.debug(f"Fetching destinations for {airport} (begin={begin}, end={end})")
         response = await self._rate_limited_request(client, url + params)
-        data = response.json()
+        return response.text
+
+    async def get_departures(
+        self,
+        client: httpx.AsyncClient,
+        airport: str,
+        begin: int,
+        end: int,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Get departure flights for an airport in a time range.
+
+        Args:
+            client: HTTP client instance
+            airport: ICAO airport code
+            begin: Begin timestamp (Unix epoch)
+            end: End timestamp (Unix epoch)
+
+        Returns:
+            Tuple of (list of flight dictionaries, raw JSON response body)
+        """
+        raw_json = await self.get_departures_json(client, airport, begin, end)
+        data = json_loads(raw_json)
+        logger.debug(f"Retrieved {len(data)} departure flights for {airport}")
+        return data, raw_json
+
+    async def get_destinations(
+        self,
+        client: httpx.AsyncClient,
+        airport: str,
+        begin: int,
+        end: int,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Get destination/arrival flights for an airport in a time range.
+
+        Args:
+            client: HTTP client instance
+            airport: ICAO airport code (destination)
+            begin: Begin timestamp (Unix epoch)
+            end: End timestamp (Unix epoch)
+
+        Returns:
+            Tuple of (list of flight dictionaries, raw JSON response body)
+        """
+        raw_json = await self.get_destinations_json(client, airport, begin, end)
+        data = json_loads(raw_json)
         logger.debug(f"Retrieved {len(data)} destination flights for {airport}")
-        return data
+        return data, raw_json
 
     @staticmethod
     def date_to_timestamps(
@@ -1,26 +1,161 @@
 """DuckDB database management for OpenSky flight data."""
 
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date
 from pathlib import Path
 from typing import Any
 
 import duckdb
 
+# On-disk format for newly created database files. v1.2.0 is the oldest format that
+# supports ZSTD-compressed strings, which shrinks the raw JSON archive several times over.
+STORAGE_COMPATIBILITY_VERSION = "v1.2.0"
+
+# Fetch results written per commit when batching with begin()/maybe_commit()
+COMMIT_BATCH_SIZE = 64
+
+# WAL size that triggers an automatic checkpoint in bulk mode (DuckDB's default is 16MB).
+# Checkpointing less often while loading saves rewriting the same row groups repeatedly;
+# the rest of the WAL is checkpointed when the database is closed.
+BULK_CHECKPOINT_THRESHOLD = "256MB"
+
+# Rows per Parquet row group; COPY buffers at most one row group per writer thread
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# DuckDB types of the API flight fields stored in the flights table
+_FLIGHT_JSON_STRUCTURE = json.dumps(
+    [
+        {
+            "icao24": "VARCHAR",
+            "firstSeen": "BIGINT",
+            "lastSeen": "BIGINT",
+            "estDepartureAirport": "VARCHAR",
+            "estArrivalAirport": "VARCHAR",
+            "callsign": "VARCHAR",
+            "estDepartureAirportHorizDistance": "INTEGER",
+            "estDepartureAirportVertDistance": "INTEGER",
+            "estArrivalAirportHorizDistance": "INTEGER",
+            "estArrivalAirportVertDistance": "INTEGER",
+            "departureAirportCandidatesCount": "INTEGER",
+            "arrivalAirportCandidatesCount": "INTEGER",
+        }
+    ]
+)
+
+# Parameters: airport, date, flight type
+_HAS_DATA_SQL = """
+    SELECT 1 FROM raw_responses
+    WHERE airport = ? AND date = ? AND flight_type = ?
+    LIMIT 1
+"""
+
+# Parameters: airport, date, flight type
+_GET_RAW_RESPONSE_SQL = """
+    SELECT raw_json FROM raw_responses
+    WHERE airport = ? AND date = ? AND flight_type = ?
+"""
+
+# Parameters: airport, date, flight type, raw JSON
+_INSERT_RAW_RESPONSE_SQL = """
+    INSERT OR REPLACE INTO raw_responses (airport, date, flight_type, raw_json)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Parameters: airport, date, flight type
+_DELETE_FLIGHTS_SQL = "DELETE FROM flights WHERE airport = ? AND date = ? AND flight_type = ?"
+
+# Parameters: airport, date, flight type, JSON array of flights
+_INSERT_FLIGHTS_SQL = f"""
+    INSERT INTO flights (
+        airport, date, flight_type, icao24, first_seen, last_seen,
+        est_departure_airport, est_arrival_airport, callsign,
+        est_departure_airport_horiz_distance,
+        est_departure_airport_vert_distance,
+        est_arrival_airport_horiz_distance,
+        est_arrival_airport_vert_distance,
+        departure_airport_candidates_count,
+        arrival_airport_candidates_count
+    )
+    SELECT
+        $1, $2, $3, icao24, firstSeen, lastSeen,
+        estDepartureAirport, estArrivalAirport, callsign,
+        estDepartureAirportHorizDistance,
+        estDepartureAirportVertDistance,
+        estArrivalAirportHorizDistance,
+        estArrivalAirportVertDistance,
+        departureAirportCandidatesCount,
+        arrivalAirportCandidatesCount
+    FROM (
+        SELECT unnest(flights, recursive := true), generate_subscripts(flights, 1) AS position
+        FROM (SELECT from_json($4, '{_FLIGHT_JSON_STRUCTURE}') AS flights)
+    )
+    WHERE icao24 IS NOT NULL AND icao24 <> '' AND firstSeen IS NOT NULL
+    QUALIFY row_number() OVER (PARTITION BY icao24, firstSeen ORDER BY position DESC) = 1
+"""  # noqa: S608 - only the constant structure above is interpolated
+
+
+def _sql_string_literal(value: str) -> str:
+    """Quote a string as a SQL string literal.
+
+    Args:
+        value: String to quote
+
+    Returns:
+        Single-quoted literal with embedded quotes escaped
+    """
+    return "'" + value.replace("'", "''") + "'"
+
 
 class FlightDatabase:
     """Manages DuckDB database for flight data storage.
 
     Args:
         db_path: Path to the DuckDB database file
+        commit_batch_size: Fetch results per commit when batching (see maybe_commit())
+        bulk_mode: Defer creating secondary indexes until finalize_indexes() is called, so
+            a fresh database is loaded without maintaining them on every insert, and
+            checkpoint less often (see BULK_CHECKPOINT_THRESHOLD)
+        threads: Number of DuckDB worker threads (default: one per CPU core)
+        memory_limit: DuckDB memory limit such as "4GB" (default: 80% of system memory)
     """
 
-    def __init__(self, db_path: str = "flights.duckdb"):
+    def __init__(
+        self,
+        db_path: str = "flights.duckdb",
+        commit_batch_size: int = COMMIT_BATCH_SIZE,
+        bulk_mode: bool = False,
+        threads: int | None = None,
+        memory_limit: str | None = None,
+    ):
         self.db_path = Path(db_path)
-        self.conn = duckdb.connect(str(self.db_path))
+        self.commit_batch_size = commit_batch_size
+        config: dict[str, str | bool | int | float | list[str]] = {
+            "storage_compatibility_version": STORAGE_COMPATIBILITY_VERSION,
+            # Everything read back is explicitly ordered, so DuckDB may reorder rows
+            # to parallelize inserts and exports
+            "preserve_insertion_order": False,
+        }
+        if bulk_mode:
+            config["checkpoint_threshold"] = BULK_CHECKPOINT_THRESHOLD
+        if threads is not None:
+            config["threads"] = threads
+        if memory_limit is not None:
+            config["memory_limit"] = memory_limit
+        self.conn = duckdb.connect(str(self.db_path), config=config)
+        # The CLI draws its own progress bar
+        self.conn.execute("SET enable_progress_bar = false")
+        # Whether begin() has opened a transaction that is still pending
+        self._in_transaction = False
+        # Fetch results written in the open transaction
+        self.uncommitted_count = 0
         self._create_schema()
+        if not bulk_mode:
+            self.finalize_indexes()
 
     def _create_schema(self) -> None:
-        """Create database tables and indexes if they don't exist."""
+        """Create database tables if they don't exist."""
         # Table for raw API responses
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS raw_responses (
@@ -28,12 +163,14 @@ class FlightDatabase:
                 date DATE NOT NULL,
                 flight_type VARCHAR NOT NULL,
                 request_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                raw_json JSON NOT NULL,
+                raw_json JSON NOT NULL USING COMPRESSION zstd,
                 PRIMARY KEY (airport, date, flight_type)
             )
         """)
 
-        # Table for parsed flight data
+        # Table for parsed flight data. There is no primary key: insert_flights_json
+        # replaces a whole airport/date/type at once and drops duplicate flights itself,
+        # so a key index would only be extra work on every insert.
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS flights (
                 airport VARCHAR NOT NULL,
@@ -50,11 +187,16 @@ class FlightDatabase:
                 est_arrival_airport_horiz_distance INTEGER,
                 est_arrival_airport_vert_distance INTEGER,
                 departure_airport_candidates_count INTEGER,
-                arrival_airport_candidates_count INTEGER,
-                PRIMARY KEY (airport, date, flight_type, icao24, first_seen)
+                arrival_airport_candidates_count INTEGER
             )
         """)
 
+    def finalize_indexes(self) -> None:
+        """Create the secondary indexes on the flights table if they don't exist.
+
+        Called automatically unless the database was opened in bulk mode. Building an
+        index once over loaded data is cheaper than maintaining it row by row.
+        """
         # Create indexes for better query performance
         self.conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_flights_airport_date
@@ -87,12 +229,51 @@ class FlightDatabase:
         Returns:
             True if data exists, False otherwise
         """
+        # Stop at the first match instead of counting every row
+        result = self.conn.execute(_HAS_DATA_SQL, [airport, flight_date, flight_type]).fetchone()
+        return result is not None
+
+    def get_raw_response(self, airport: str, flight_date: date, flight_type: str) -> str | None:
+        """Get the stored raw API response for an airport, date, and flight type.
+
+        Args:
+            airport: ICAO airport code
+            flight_date: Date of flights
+            flight_type: Type of flights ("departure" or "destination")
+
+        Returns:
+            Raw JSON response as fetched, or None if nothing is stored
+        """
         result = self.conn.execute(
-            "SELECT COUNT(*) FROM raw_responses WHERE airport = ? AND date = ? AND flight_type = ?",
-            [airport, flight_date, flight_type],
+            _GET_RAW_RESPONSE_SQL, [airport, flight_date, flight_type]
         ).fetchone()
-        assert result is not None  # COUNT(*) always returns a result
-        return result[0] > 0
+        return result[0] if result else None
+
+    def existing_keys(
+        self, flight_type: str, airports: list[str], start_date: date, end_date: date
+    ) -> set[tuple[str, date]]:
+        """Get all stored airport/date combinations for a flight type in one query.
+
+        Args:
+            flight_type: Type of flights ("departure" or "destination")
+            airports: ICAO airport codes to look up
+            start_date: First date of the range (inclusive)
+            end_date: Last date of the range (inclusive)
+
+        Returns:
+            Set of (airport, date) tuples that already have a raw response stored
+        """
+        if not airports:
+            return set()
+
+        placeholders = ",".join("?" * len(airports))
+        # Note: only placeholders are interpolated, all values are bound parameters
+        query = f"""
+            SELECT airport, date FROM raw_responses
+            WHERE flight_type = ? AND airport IN ({placeholders}) AND date BETWEEN ? AND ?
+        """  # noqa: S608
+        rows = self.conn.execute(query, [flight_type, *airports, start_date, end_date]).fetchall()
+        return set(rows)
 
     def insert_raw_response(
         self, airport: str, flight_date: date, flight_type: str, raw_json: str
@@ -105,13 +286,7 @@ class FlightDatabase:
             flight_type: Type of flights ("departure" or "destination")
             raw_json: Raw JSON response from API
         """
-        self.conn.execute(
-            """
-            INSERT OR REPLACE INTO raw_responses (airport, date, flight_type, raw_json)
-            VALUES (?, ?, ?, ?)
-            """,
-            [airport, flight_date, flight_type, raw_json],
-        )
+        self.conn.execute(_INSERT_RAW_RESPONSE_SQL, [airport, flight_date, flight_type, raw_json])
 
     def insert_flights(
         self, airport: str, flight_date: date, flight_type: str, flights: list[dict[str, Any]]
@@ -124,53 +299,130 @@ class FlightDatabase:
             flight_type: Type of flights ("departure" or "destination")
             flights: List of flight dictionaries
         """
-        # First, delete any existing flights for this airport/date/type
-        self.conn.execute(
-            "DELETE FROM flights WHERE airport = ? AND date = ? AND flight_type = ?",
-            [airport, flight_date, flight_type],
-        )
+        self.insert_flights_json(airport, flight_date, flight_type, json.dumps(flights))
 
-        # Insert new flight records
-        for flight in flights:
-            # Skip flights missing required fields
-            if not flight.get("icao24") or flight.get("firstSeen") is None:
-                continue
-
-            self.conn.execute(
-                """
-                INSERT OR REPLACE INTO flights (
-                    airport, date, flight_type, icao24, first_seen, last_seen,
-                    est_departure_airport, est_arrival_airport, callsign,
-                    est_departure_airport_horiz_distance,
-                    est_departure_airport_vert_distance,
-                    est_arrival_airport_horiz_distance,
-                    est_arrival_airport_vert_distance,
-                    departure_airport_candidates_count,
-                    arrival_airport_candidates_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
-                    airport,
-                    flight_date,
-                    flight_type,
-                    flight.get("icao24"),
-                    flight.get("firstSeen"),
-                    flight.get("lastSeen"),
-                    flight.get("estDepartureAirport"),
-                    flight.get("estArrivalAirport"),
-                    flight.get("callsign"),
-                    flight.get("estDepartureAirportHorizDistance"),
-                    flight.get("estDepartureAirportVertDistance"),
-                    flight.get("estArrivalAirportHorizDistance"),
-                    flight.get("estArrivalAirportVertDistance"),
-                    flight.get("departureAirportCandidatesCount"),
-                    flight.get("arrivalAirportCandidatesCount"),
-                ],
-            )
+    def insert_flights_json(
+        self, airport: str, flight_date: date, flight_type: str, flights_json: str
+    ) -> int:
+        """Insert flight data straight from a JSON array of API flight records.
+
+        Args:
+            airport: ICAO airport code
+            flight_date: Date of flights
+            flight_type: Type of flights ("departure" or "destination")
+            flights_json: JSON array of flight objects, as returned by the API
+
+        Returns:
+            Number of flights stored
+        """
+        # Replace rather than add: if the insert fails, the old flights must survive
+        with self._transaction():
+            # First, delete any existing flights for this airport/date/type
+            self.conn.execute(_DELETE_FLIGHTS_SQL, [airport, flight_date, flight_type])
+
+            # Insert all flights in one statement: DuckDB parses the JSON array and unnests
+            # it into rows. Flights missing required fields are skipped, and for duplicate
+            # (icao24, firstSeen) pairs the last occurrence wins.
+            result = self.conn.execute(
+                _INSERT_FLIGHTS_SQL, [airport, flight_date, flight_type, flights_json]
+            ).fetchone()
+        return result[0] if result else 0
+
+    def insert_fetch_result(
+        self, airport: str, flight_date: date, flight_type: str, raw_json: str
+    ) -> int:
+        """Store one API response: the raw JSON and the flights projected from it.
+
+        The flights are read from raw_json by DuckDB, so the response is never
+        re-serialized. Both writes share a single transaction. If the caller already
+        has one open (see begin()), they become part of it; otherwise they are
+        committed together.
+
+        Args:
+            airport: ICAO airport code
+            flight_date: Date of flights
+            flight_type: Type of flights ("departure" or "destination")
+            raw_json: Raw JSON response from API
+
+        Returns:
+            Number of flights stored
+        """
+        batched = self._in_transaction
+        with self._transaction():
+            self.insert_raw_response(airport, flight_date, flight_type, raw_json)
+            flight_count = self.insert_flights_json(airport, flight_date, flight_type, raw_json)
+        if batched:
+            self.uncommitted_count += 1
+        return flight_count
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run a group of writes atomically.
+
+        Inside a transaction opened with begin() the writes simply join it. Otherwise
+        they get a transaction of their own, committed when the block completes.
+
+        Yields:
+            None: Control to the block, whose writes share the transaction
+
+        Raises:
+            Exception: Re-raises any error from the block after rolling back its own
+                transaction
+        """
+        if self._in_transaction:
+            yield
+        else:
+            self.begin()
+            try:
+                yield
+            except Exception:
+                self.rollback()
+                raise
+            self.commit()
+
+    def begin(self) -> None:
+        """Start an explicit transaction so that several writes share one commit."""
+        self.conn.begin()
+        self._in_transaction = True
+        self.uncommitted_count = 0
 
     def commit(self) -> None:
         """Commit any pending transactions."""
         self.conn.commit()
+        self._in_transaction = False
+        self.uncommitted_count = 0
+
+    def maybe_commit(self, force: bool = False) -> None:
+        """Commit the open batch once it holds commit_batch_size fetch results.
+
+        A new batch is started straight away, so later writes keep sharing commits.
+        With force=True the batch is committed whatever its size and none is started.
+
+        Args:
+            force: Commit even if the batch is not full, ending batching
+        """
+        if not self._in_transaction:
+            return
+        if force:
+            self.commit()
+        elif self.uncommitted_count >= self.commit_batch_size:
+            self.commit()
+            self.begin()
+
+    def rollback(self) -> None:
+        """Roll back the current transaction, discarding uncommitted writes."""
+        self.conn.rollback()
+        self._in_transaction = False
+        self.uncommitted_count = 0
+
+    def checkpoint(self) -> None:
+        """Write the WAL into the database file.
+
+        Bulk mode checkpoints rarely while loading, so call this once at the end of a
+        load, after finalize_indexes(), to persist the data and the new indexes in a
+        single pass.
+        """
+        self.conn.execute("CHECKPOINT")
 
     def close(self) -> None:
         """Close database connection."""
@@ -219,15 +471,16 @@ class FlightDatabase:
         )
 
         # Export to CSV using DuckDB's native COPY command
-        # Note: query is built safely in _build_export_query with parameterized conditions
-        copy_query = f"COPY ({query}) TO ? WITH (HEADER, DELIMITER ',')"  # noqa: S608
-        self.conn.execute(copy_query, params + [output_path])
+        # Note: query is built safely in _build_export_query with parameterized conditions.
+        # The target is inlined because DuckDB numbers a COPY's TO parameter before
+        # the parameters of the inner query.
+        target = _sql_string_literal(output_path)
+        copy_query = f"COPY ({query}) TO {target} WITH (HEADER, DELIMITER ',')"  # noqa: S608
 
-        # Count rows
-        count_query = f"SELECT COUNT(*) FROM ({query})"  # noqa: S608
-        count_result = self.conn.execute(count_query, params).fetchone()
-        assert count_result is not None
-        return count_result[0]
+        # COPY reports the number of rows it wrote
+        result = self.conn.execute(copy_query, params).fetchone()
+        assert result is not None
+        return result[0]
 
     def export_to_parquet(
         self,
@@ -236,15 +489,20 @@ class FlightDatabase:
         arrival_airports: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
+        partitioned: bool = False,
     ) -> int:
         """Export flight data to Parquet file.
 
         Args:
-            output_path: Path to output Parquet file
+            output_path: Path to output Parquet file, or directory if partitioned
             departure_airports: Filter by departure airport codes (optional)
             arrival_airports: Filter by arrival airport codes (optional)
             start_date: Filter by start date (optional)
             end_date: Filter by end date (optional)
+            partitioned: Write a Hive-partitioned dataset with one directory per airport
+                and date (airport=KMCO/date=2024-01-01/...), which readers can prune
+                with read_parquet(..., hive_partitioning=true). Like a single-file
+                export, this replaces the output of any earlier export to the same path.
 
         Returns:
             Number of rows exported
@@ -253,16 +511,24 @@ class FlightDatabase:
             departure_airports, arrival_airports, start_date, end_date
         )
 
-        # Export to Parquet using DuckDB's native COPY command
-        # Note: query is built safely in _build_export_query with parameterized conditions
-        copy_query = f"COPY ({query}) TO ? (FORMAT PARQUET)"  # noqa: S608
-        self.conn.execute(copy_query, params + [output_path])
-
-        # Count rows
-        count_query = f"SELECT COUNT(*) FROM ({query})"  # noqa: S608
-        count_result = self.conn.execute(count_query, params).fetchone()
-        assert count_result is not None
-        return count_result[0]
+        # Export to Parquet using DuckDB's native COPY command (ZSTD-compressed). COPY
+        # streams the result into the file one row group at a time, so memory stays
+        # bounded by the row group size rather than the size of the export.
+        # Note: query is built safely in _build_export_query with parameterized conditions.
+        # The target is inlined because DuckDB numbers a COPY's TO parameter before
+        # the parameters of the inner query.
+        target = _sql_string_literal(output_path)
+        options = f"FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE}"
+        if partitioned:
+            # OVERWRITE clears files left by an earlier export, which COPY otherwise
+            # refuses to write over
+            options += ", PARTITION_BY (airport, date), OVERWRITE"
+        copy_query = f"COPY ({query}) TO {target} ({options})"  # noqa: S608
+
+        # COPY reports the number of rows it wrote
+        result = self.conn.execute(copy_query, params).fetchone()
+        assert result is not None
+        return result[0]
 
     def _build_export_query(
         self,
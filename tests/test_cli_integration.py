@@ -1,12 +1,16 @@
 """Integration tests for CLI."""
 
 import os
+from datetime import date
 from unittest.mock import patch
 
+import duckdb
+import httpx
 import pytest
 from click.testing import CliRunner
 
-from opensky_fetcher.cli import cli
+from opensky_fetcher.cli import _make_http_client, cli
+from opensky_fetcher.database import FlightDatabase
 
 
 class TestCLIIntegration:
@@ -91,6 +95,63 @@ class TestCLIIntegration:
         assert result.exit_code != 0
         assert "Start date must be before or equal to end date" in result.output
 
+    def test_cli_invalid_date_format(self, runner, mock_env, temp_db_path):
+        """Test CLI rejects malformed dates while parsing options."""
+        result = runner.invoke(
+            cli,
+            [
+                "flights",
+                "departure",
+                "-a",
+                "KMCO",
+                "-s",
+                "2024-13-01",
+                "-e",
+                "2024-01-01",
+                "-d",
+                temp_db_path,
+            ],
+        )
+
+        assert result.exit_code == 2  # Click usage error
+        assert "Invalid value for '--start-date'" in result.output
+        assert "Invalid date/datetime format: '2024-13-01'" in result.output
+
+    def test_cli_invalid_db_memory_limit(self, runner, mock_env, temp_db_path):
+        """Test CLI reports a memory limit DuckDB rejects as an error, not a traceback."""
+        result = runner.invoke(
+            cli,
+            [
+                "flights",
+                "departure",
+                "-a",
+                "KMCO",
+                "-s",
+                "2024-01-01",
+                "-e",
+                "2024-01-01",
+                "-d",
+                temp_db_path,
+                "--db-memory-limit",
+                "foo",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert f"Could not open database '{temp_db_path}'" in result.output
+
+    def test_export_invalid_db_memory_limit(self, runner, temp_db_path):
+        """Test export reports a memory limit DuckDB rejects as an error."""
+        FlightDatabase(temp_db_path).close()
+
+        result = runner.invoke(
+            cli,
+            ["export", temp_db_path + ".csv", "-d", temp_db_path, "--db-memory-limit", "foo"],
+        )
+
+        assert result.exit_code == 1
+        assert f"Could not open database '{temp_db_path}'" in result.output
+
     def test_cli_valid_airport_with_invalid(self, runner, mock_env, temp_db_path):
         """Test CLI skips invalid codes but processes valid ones."""
         result = runner.invoke(
@@ -184,3 +245,119 @@ class TestCLILogging:
         )
 
         assert "Fetch OpenSky Network departure flight data" in result.output
+
+
+class TestFetchPipeline:
+    """End-to-end tests of the fetch pipeline against a mocked OpenSky API."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    @pytest.fixture
+    def api_requests(self):
+        """Serve the OpenSky API from a mock transport and record the flight requests.
+
+        Each response holds one flight, whose icao24 is the requested airport and
+        whose firstSeen is the requested begin timestamp.
+        """
+        requests: list[httpx.QueryParams] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("auth."):
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            params = request.url.params
+            requests.append(params)
+            flight = {"icao24": params["airport"], "firstSeen": int(params["begin"])}
+            return httpx.Response(200, json=[flight])
+
+        def make_client(max_concurrent):
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        credentials = {"OPENSKY_CLIENT_ID": "test", "OPENSKY_CLIENT_SECRET": "test"}
+        with (
+            patch.dict(os.environ, credentials),
+            patch("opensky_fetcher.cli._make_http_client", make_client),
+        ):
+            yield requests
+
+    def fetch(self, runner, db_path, airports, start, end):
+        """Run `flights departure` without rate limiting."""
+        args = ["flights", "departure", "-a", airports, "-s", start, "-e", end]
+        return runner.invoke(cli, [*args, "-d", db_path, "-c", "3", "-r", "0", "-q"])
+
+    def test_fetch_stores_every_result_and_skips_on_rerun(self, runner, api_requests, temp_db_path):
+        """Test that all fetched airport/dates are stored, and a rerun fetches nothing."""
+        result = self.fetch(runner, temp_db_path, "KMCO,KJFK,KLAX", "2024-01-01", "2024-01-04")
+        assert result.exit_code == 0, result.output
+        assert len(api_requests) == 12
+
+        expected = {
+            (airport, date(2024, 1, day))
+            for airport in ("KMCO", "KJFK", "KLAX")
+            for day in range(1, 5)
+        }
+        with FlightDatabase(temp_db_path) as db:
+            stored = set(db.conn.execute("SELECT airport, date FROM raw_responses").fetchall())
+            flights = set(db.conn.execute("SELECT airport, date FROM flights").fetchall())
+        assert stored == expected
+        assert flights == expected
+
+        api_requests.clear()
+        result = self.fetch(runner, temp_db_path, "KMCO,KJFK,KLAX", "2024-01-01", "2024-01-04")
+        assert result.exit_code == 0, result.output
+        assert api_requests == []
+
+    def test_datetime_range_narrows_first_and_last_day(self, runner, api_requests, temp_db_path):
+        """Test that only the edge days of a datetime range are cut to the given times."""
+        result = self.fetch(
+            runner, temp_db_path, "KMCO", "2024-01-01 06:00:00", "2024-01-03 18:30:00"
+        )
+        assert result.exit_code == 0, result.output
+
+        windows = sorted((int(p["begin"]), int(p["end"])) for p in api_requests)
+        assert windows == [
+            (1704088800, 1704153599),  # 2024-01-01 06:00:00 to end of day
+            (1704153600, 1704239999),  # all of 2024-01-02
+            (1704240000, 1704306600),  # start of 2024-01-03 to 18:30:00
+        ]
+
+    def test_database_error_keeps_rest_of_batch(self, runner, api_requests, temp_db_path):
+        """Test that one failing insert loses only that result, not its whole batch."""
+        failing = ("KJFK", date(2024, 1, 2))
+        insert_flights_json = FlightDatabase.insert_flights_json
+
+        def fail_one(self, airport, flight_date, flight_type, flights_json):
+            if (airport, flight_date) == failing:
+                raise duckdb.Error("insert failed")
+            return insert_flights_json(self, airport, flight_date, flight_type, flights_json)
+
+        with patch.object(FlightDatabase, "insert_flights_json", fail_one):
+            result = self.fetch(runner, temp_db_path, "KMCO,KJFK,KLAX", "2024-01-01", "2024-01-04")
+        assert result.exit_code == 0, result.output
+
+        expected = {
+            (airport, date(2024, 1, day))
+            for airport in ("KMCO", "KJFK", "KLAX")
+            for day in range(1, 5)
+        } - {failing}
+        with FlightDatabase(temp_db_path) as db:
+            stored = set(db.conn.execute("SELECT airport, date FROM raw_responses").fetchall())
+            flights = set(db.conn.execute("SELECT airport, date FROM flights").fetchall())
+        assert stored == expected
+        assert flights == expected
+
+
+class TestMakeHttpClient:
+    """Tests for the shared HTTP client configuration."""
+
+    @pytest.mark.asyncio
+    async def test_honors_environment_proxies(self):
+        """Test that a proxy from the environment is mounted for https:// URLs."""
+        with patch.dict(os.environ, {"HTTPS_PROXY": "http://proxy.example:8080"}):
+            client = _make_http_client(5)
+
+        async with client:
+            # httpx has no public view of its proxy mounts
+            assert "https://" in {pattern.pattern for pattern in client._mounts}
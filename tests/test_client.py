@@ -1,5 +1,7 @@
 """Tests for OpenSky API client."""
 
+import asyncio
+import json
 import os
 from datetime import date, datetime, timezone
 
@@ -62,7 +64,7 @@ class TestOpenSkyClientAPI:
         async with httpx.AsyncClient() as http_client:
             # Use a specific date/airport that we'll record
             begin, end = OpenSkyClient.date_to_timestamps(date(2024, 1, 1))
-            flights = await client.get_departures(
+            flights, raw_json = await client.get_departures(
                 http_client,
                 "KMCO",
                 begin,
@@ -70,6 +72,7 @@ class TestOpenSkyClientAPI:
             )
 
             assert isinstance(flights, list)
+            assert json.loads(raw_json) == flights
             # Should have flights (based on our recorded data)
             assert len(flights) > 0
 
@@ -140,3 +143,123 @@ class TestOpenSkyClient:
         assert client.max_concurrent == 10
         assert client.rate_limit_delay == 1.5
         assert client._semaphore._value == 10
+
+    def test_rate_limit_slots_are_spaced(self):
+        """Test that concurrent callers reserve evenly spaced request slots."""
+        client = OpenSkyClient(
+            client_id="test",
+            client_secret="test",  # noqa: S106
+            rate_limit_delay=1.0,
+        )
+
+        waits = [client._reserve_request_slot() for _ in range(3)]
+
+        assert waits[0] == 0
+        assert waits[1] == pytest.approx(1.0, abs=0.1)
+        assert waits[2] == pytest.approx(2.0, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_request_retries_transient_errors(self):
+        """Test that rate limiting and server errors are retried."""
+        statuses = iter([429, 503, 200])
+        api_calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("auth."):
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            api_calls.append(request.url)
+            status = next(statuses)
+            body = [] if status == 200 else None
+            return httpx.Response(status, headers={"Retry-After": "0"}, json=body)
+
+        client = OpenSkyClient(client_id="test", client_secret="test", rate_limit_delay=0)  # noqa: S106
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            flights, raw_json = await client.get_departures(http_client, "KMCO", 0, 1)
+
+        assert flights == []
+        assert raw_json == "[]"
+        assert len(api_calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_get_flights_json_returns_raw_body(self):
+        """Test that the *_json methods return the response body without parsing it."""
+        body = '[{"icao24": "abc123", "firstSeen": 1704067200}]'
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("auth."):
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            paths.append(request.url.path)
+            return httpx.Response(200, text=body)
+
+        client = OpenSkyClient(client_id="test", client_secret="test", rate_limit_delay=0)  # noqa: S106
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            departures = await client.get_departures_json(http_client, "KMCO", 0, 1)
+            arrivals = await client.get_destinations_json(http_client, "KMCO", 0, 1)
+
+        assert departures == body
+        assert arrivals == body
+        assert paths == ["/api/flights/departure", "/api/flights/arrival"]
+
+    @pytest.mark.asyncio
+    async def test_request_retries_connection_errors(self, monkeypatch):
+        """Test that failed connection attempts are retried."""
+        monkeypatch.setattr("opensky_fetcher.client.CONNECT_RETRY_BASE_DELAY", 0)
+        failures = iter([httpx.ConnectError("refused"), httpx.ConnectTimeout("timed out")])
+        api_calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("auth."):
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            api_calls.append(request.url)
+            failure = next(failures, None)
+            if failure is not None:
+                raise failure
+            return httpx.Response(200, json=[])
+
+        client = OpenSkyClient(client_id="test", client_secret="test", rate_limit_delay=0)  # noqa: S106
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            flights, _ = await client.get_departures(http_client, "KMCO", 0, 1)
+
+        assert flights == []
+        assert len(api_calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_request_does_not_retry_client_errors(self):
+        """Test that non-transient errors are raised straight away."""
+        api_calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("auth."):
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            api_calls.append(request.url)
+            return httpx.Response(404)
+
+        client = OpenSkyClient(client_id="test", client_secret="test", rate_limit_delay=0)  # noqa: S106
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_departures(http_client, "KMCO", 0, 1)
+
+        assert len(api_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_token_refresh(self):
+        """Test that concurrent first requests trigger a single OAuth request."""
+        auth_calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            auth_calls.append(request.url)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+
+        client = OpenSkyClient(client_id="test", client_secret="test")  # noqa: S106
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            tokens = await asyncio.gather(*(client._get_token(http_client) for _ in range(5)))
+
+        assert tokens == ["token"] * 5
+        assert len(auth_calls) == 1
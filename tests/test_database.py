@@ -1,6 +1,11 @@
 """Tests for database operations."""
 
+import json
 from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
 
 from opensky_fetcher.database import FlightDatabase
 
@@ -21,6 +26,73 @@ class TestFlightDatabase:
 
         db.close()
 
+    def test_bulk_mode_defers_indexes(self, temp_db_path):
+        """Test that bulk mode only creates secondary indexes on finalize."""
+        db = FlightDatabase(temp_db_path, bulk_mode=True)
+
+        def index_names():
+            rows = db.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+            return {row[0] for row in rows}
+
+        assert index_names() == set()
+
+        db.finalize_indexes()
+        assert "idx_flights_airport_date" in index_names()
+        db.close()
+
+    def test_checkpoint_empties_wal(self, temp_db_path):
+        """Test that checkpoint writes pending changes into the database file."""
+        db = FlightDatabase(temp_db_path, bulk_mode=True)
+        db.insert_fetch_result(
+            "KMCO", date(2024, 1, 1), "departure", '[{"icao24": "abc123", "firstSeen": 1}]'
+        )
+
+        wal_path = Path(temp_db_path + ".wal")
+        assert wal_path.stat().st_size > 0
+
+        db.checkpoint()
+        assert not wal_path.exists() or wal_path.stat().st_size == 0
+        db.close()
+
+    def test_bulk_mode_raises_checkpoint_threshold(self, temp_db_path):
+        """Test that bulk mode checkpoints less often than the default."""
+        query = "SELECT current_setting('checkpoint_threshold')"
+
+        with FlightDatabase(temp_db_path) as db:
+            default_threshold = db.conn.execute(query).fetchone()
+        with FlightDatabase(temp_db_path, bulk_mode=True) as db:
+            bulk_threshold = db.conn.execute(query).fetchone()
+
+        assert bulk_threshold != default_threshold
+
+    def test_connection_tuning(self, temp_db_path):
+        """Test that threads and memory limit are applied to the connection."""
+        db = FlightDatabase(temp_db_path, threads=1, memory_limit="512MB")
+
+        row = db.conn.execute(
+            "SELECT current_setting('threads'), current_setting('preserve_insertion_order')"
+        ).fetchone()
+        assert row is not None
+        threads, preserve_order = row
+        assert threads == 1
+        assert preserve_order is False
+        db.close()
+
+    def test_raw_json_is_zstd_compressed(self, temp_db_path):
+        """Test that stored raw responses are compressed with ZSTD."""
+        db = FlightDatabase(temp_db_path)
+
+        raw_json = json.dumps([{"icao24": f"{i:06x}", "firstSeen": i} for i in range(1000)])
+        db.insert_raw_response("KMCO", date(2024, 1, 1), "departure", raw_json)
+        db.conn.execute("CHECKPOINT")
+
+        result = db.conn.execute(
+            "SELECT DISTINCT compression FROM pragma_storage_info('raw_responses') "
+            "WHERE column_name = 'raw_json' AND segment_type = 'JSON'"
+        ).fetchall()
+        assert result == [("ZSTD",)]
+        db.close()
+
     def test_has_data_empty_database(self, temp_db_path):
         """Test has_data returns False for empty database."""
         db = FlightDatabase(temp_db_path)
@@ -43,6 +115,22 @@ class TestFlightDatabase:
         assert result is True
         db.close()
 
+    def test_existing_keys(self, temp_db_path):
+        """Test existing_keys returns stored airport/date pairs within the filters."""
+        db = FlightDatabase(temp_db_path)
+
+        db.insert_raw_response("KMCO", date(2024, 1, 1), "departure", "[]")
+        db.insert_raw_response("KMCO", date(2024, 1, 3), "departure", "[]")
+        db.insert_raw_response("KJFK", date(2024, 1, 2), "departure", "[]")
+        db.insert_raw_response("KMCO", date(2024, 1, 2), "destination", "[]")
+        db.insert_raw_response("KLAX", date(2024, 1, 2), "departure", "[]")
+        db.commit()
+
+        result = db.existing_keys("departure", ["KMCO", "KJFK"], date(2024, 1, 1), date(2024, 1, 2))
+
+        assert result == {("KMCO", date(2024, 1, 1)), ("KJFK", date(2024, 1, 2))}
+        db.close()
+
     def test_insert_raw_response(self, temp_db_path):
         """Test inserting raw response."""
         db = FlightDatabase(temp_db_path)
@@ -61,6 +149,17 @@ class TestFlightDatabase:
         assert result[0] == test_data
         db.close()
 
+    def test_get_raw_response(self, temp_db_path):
+        """Test reading back a stored raw response."""
+        db = FlightDatabase(temp_db_path)
+
+        raw_json = '[{"icao24": "abc123", "firstSeen": 1704067200}]'
+        db.insert_raw_response("KMCO", date(2024, 1, 1), "departure", raw_json)
+
+        assert db.get_raw_response("KMCO", date(2024, 1, 1), "departure") == raw_json
+        assert db.get_raw_response("KMCO", date(2024, 1, 1), "destination") is None
+        db.close()
+
     def test_insert_raw_response_replace(self, temp_db_path):
         """Test that inserting same airport/date replaces existing data."""
         db = FlightDatabase(temp_db_path)
@@ -153,6 +252,22 @@ class TestFlightDatabase:
         assert result[0] == "valid123"
         db.close()
 
+    def test_insert_flights_duplicates_keep_last(self, temp_db_path):
+        """Test that the last of several records with the same key is kept."""
+        db = FlightDatabase(temp_db_path)
+
+        flights = [
+            {"icao24": "abc123", "firstSeen": 1704067200, "callsign": "FIRST"},
+            {"icao24": "abc123", "firstSeen": 1704067200, "callsign": "LAST"},
+        ]
+
+        db.insert_flights("KMCO", date(2024, 1, 1), "departure", flights)
+        db.commit()
+
+        rows = db.conn.execute("SELECT callsign FROM flights").fetchall()
+        assert rows == [("LAST",)]
+        db.close()
+
     def test_insert_flights_replaces_existing(self, temp_db_path):
         """Test that inserting flights for same airport/date replaces existing."""
         db = FlightDatabase(temp_db_path)
@@ -189,6 +304,43 @@ class TestFlightDatabase:
         assert result[0] == "xyz789"
         db.close()
 
+    def test_failed_flights_insert_keeps_existing(self, temp_db_path):
+        """Test that a failed replacement leaves the previously stored flights intact."""
+        db = FlightDatabase(temp_db_path)
+
+        db.insert_flights(
+            "KMCO", date(2024, 1, 1), "departure", [{"icao24": "abc123", "firstSeen": 1}]
+        )
+        with pytest.raises(duckdb.InvalidInputException):
+            db.insert_flights_json("KMCO", date(2024, 1, 1), "departure", "not json")
+
+        rows = db.conn.execute("SELECT icao24 FROM flights").fetchall()
+        assert rows == [("abc123",)]
+        db.close()
+
+    def test_insert_fetch_result(self, temp_db_path, monkeypatch):
+        """Test that the raw response and its flights are stored together."""
+        db = FlightDatabase(temp_db_path)
+
+        raw_json = '[{"icao24": "abc123", "firstSeen": 1704067200}]'
+        assert db.insert_fetch_result("KMCO", date(2024, 1, 1), "departure", raw_json) == 1
+
+        assert db.has_data("KMCO", date(2024, 1, 1), "departure") is True
+        count_result = db.conn.execute("SELECT COUNT(*) FROM flights").fetchone()
+        assert count_result is not None
+        assert count_result[0] == 1
+
+        # A failure while storing the flights rolls back the raw response as well
+        def fail_insert_flights_json(*args):
+            raise duckdb.Error("insert failed")
+
+        monkeypatch.setattr(db, "insert_flights_json", fail_insert_flights_json)
+        with pytest.raises(duckdb.Error):
+            db.insert_fetch_result("KJFK", date(2024, 1, 1), "departure", raw_json)
+
+        assert db.has_data("KJFK", date(2024, 1, 1), "departure") is False
+        db.close()
+
     def test_context_manager(self, temp_db_path):
         """Test database works with context manager."""
         with FlightDatabase(temp_db_path) as db:
@@ -200,3 +352,132 @@ class TestFlightDatabase:
         result = db2.has_data("KMCO", date(2024, 1, 1), "departure")
         assert result is True
         db2.close()
+
+    def test_rollback_discards_uncommitted(self, temp_db_path):
+        """Test that rollback discards writes made since begin."""
+        db = FlightDatabase(temp_db_path)
+
+        db.begin()
+        db.insert_raw_response("KMCO", date(2024, 1, 1), "departure", "[]")
+        db.rollback()
+
+        assert db.has_data("KMCO", date(2024, 1, 1), "departure") is False
+        db.close()
+
+    def test_maybe_commit_batches(self, temp_db_path):
+        """Test that maybe_commit only commits once the batch is full."""
+        db = FlightDatabase(temp_db_path, commit_batch_size=2)
+
+        db.begin()
+        db.insert_fetch_result("KMCO", date(2024, 1, 1), "departure", "[]")
+        db.maybe_commit()
+        assert db.uncommitted_count == 1
+
+        db.insert_fetch_result("KMCO", date(2024, 1, 2), "departure", "[]")
+        db.maybe_commit()
+        assert db.uncommitted_count == 0
+
+        # Batching continues in a new transaction
+        db.insert_fetch_result("KMCO", date(2024, 1, 3), "departure", "[]")
+        db.rollback()
+
+        assert db.has_data("KMCO", date(2024, 1, 2), "departure") is True
+        assert db.has_data("KMCO", date(2024, 1, 3), "departure") is False
+        db.close()
+
+    def test_export_to_parquet(self, temp_db_path):
+        """Test exporting flights to a ZSTD-compressed Parquet file."""
+        db = FlightDatabase(temp_db_path)
+
+        flights = [
+            {"icao24": "abc123", "firstSeen": 1704067200},
+            {"icao24": "xyz789", "firstSeen": 1704070800},
+        ]
+        db.insert_flights("KMCO", date(2024, 1, 1), "departure", flights)
+        db.commit()
+
+        output_path = temp_db_path.replace(".duckdb", ".parquet")
+        row_count = db.export_to_parquet(output_path, departure_airports=["KMCO"])
+
+        assert row_count == 2
+        codecs = db.conn.execute(
+            "SELECT DISTINCT compression FROM parquet_metadata(?)", [output_path]
+        ).fetchall()
+        assert codecs == [("ZSTD",)]
+        db.close()
+        Path(output_path).unlink()
+
+    def test_export_to_parquet_partitioned(self, temp_db_path, tmp_path):
+        """Test exporting flights as a Parquet dataset partitioned by airport and date."""
+        db = FlightDatabase(temp_db_path)
+
+        db.insert_flights(
+            "KMCO", date(2024, 1, 1), "departure", [{"icao24": "abc123", "firstSeen": 1}]
+        )
+        db.insert_flights(
+            "KMCO", date(2024, 1, 2), "departure", [{"icao24": "xyz789", "firstSeen": 2}]
+        )
+
+        output_dir = tmp_path / "flights"
+        row_count = db.export_to_parquet(str(output_dir), partitioned=True)
+
+        assert row_count == 2
+        assert (output_dir / "airport=KMCO" / "date=2024-01-02").is_dir()
+        rows = db.conn.execute(
+            "SELECT airport, date, icao24 FROM read_parquet(?, hive_partitioning = true) "
+            "ORDER BY date",
+            [str(output_dir / "**" / "*.parquet")],
+        ).fetchall()
+        assert rows == [
+            ("KMCO", date(2024, 1, 1), "abc123"),
+            ("KMCO", date(2024, 1, 2), "xyz789"),
+        ]
+        db.close()
+
+    def test_export_to_parquet_partitioned_twice(self, temp_db_path, tmp_path):
+        """Test that a partitioned export replaces the output of an earlier one."""
+        db = FlightDatabase(temp_db_path)
+        output_dir = tmp_path / "flights"
+        parquet_files = str(output_dir / "**" / "*.parquet")
+
+        db.insert_flights(
+            "KMCO", date(2024, 1, 1), "departure", [{"icao24": "abc123", "firstSeen": 1}]
+        )
+        assert db.export_to_parquet(str(output_dir), partitioned=True) == 1
+
+        db.conn.execute("DELETE FROM flights")
+        db.insert_flights(
+            "KJFK", date(2024, 1, 2), "departure", [{"icao24": "xyz789", "firstSeen": 2}]
+        )
+        assert db.export_to_parquet(str(output_dir), partitioned=True) == 1
+
+        rows = db.conn.execute(
+            "SELECT airport, date, icao24 FROM read_parquet(?, hive_partitioning = true)",
+            [parquet_files],
+        ).fetchall()
+        assert rows == [("KJFK", date(2024, 1, 2), "xyz789")]
+        db.close()
+
+    def test_export_to_csv_with_filters(self, temp_db_path):
+        """Test exporting filtered flights to CSV writes to the requested path."""
+        db = FlightDatabase(temp_db_path)
+
+        db.insert_flights(
+            "KMCO", date(2024, 1, 1), "departure", [{"icao24": "abc123", "firstSeen": 1704067200}]
+        )
+        db.insert_flights(
+            "KJFK", date(2024, 1, 1), "departure", [{"icao24": "xyz789", "firstSeen": 1704070800}]
+        )
+        db.commit()
+
+        output_path = temp_db_path.replace(".duckdb", ".csv")
+        row_count = db.export_to_csv(
+            output_path, departure_airports=["KMCO"], start_date=date(2024, 1, 1)
+        )
+
+        assert row_count == 1
+        lines = Path(output_path).read_text().splitlines()
+        assert len(lines) == 2  # header + one row
+        assert "abc123" in lines[1]
+        db.close()
+        Path(output_path).unlink()
@@ -1,9 +1,12 @@
 """Tests for validation functions."""
 
 from datetime import date, datetime
+from itertools import pairwise
 
 import pytest
 from click import ClickException
+from hypothesis import given
+from hypothesis import strategies as st
 
 from opensky_fetcher.cli import generate_date_range, parse_and_validate_airports, parse_date
 
@@ -28,6 +31,12 @@ class TestParseDate:
         assert isinstance(result, datetime)
         assert result == datetime(2024, 1, 15, 10, 30, 0)
 
+    def test_valid_datetime_with_lowercase_t(self):
+        """Test parsing a datetime with a lowercase t separator."""
+        result = parse_date("2024-01-15t10:00")
+        assert isinstance(result, datetime)
+        assert result == datetime(2024, 1, 15, 10, 0, 0)
+
     def test_valid_datetime_with_seconds(self):
         """Test parsing a datetime with full precision."""
         result = parse_date("2024-01-15T14:25:33")
@@ -48,60 +57,52 @@ class TestParseDate:
 class TestParseAndValidateAirports:
     """Tests for parse_and_validate_airports function."""
 
-    def test_valid_single_airport(self):
-        """Test parsing a single valid airport code."""
-        result = parse_and_validate_airports("KMCO")
-        assert result == ["KMCO"]
-
-    def test_valid_multiple_airports(self):
-        """Test parsing multiple valid airport codes."""
-        result = parse_and_validate_airports("KMCO,KJFK,KLAX")
-        assert result == ["KMCO", "KJFK", "KLAX"]
-
-    def test_lowercase_converted_to_uppercase(self):
-        """Test that lowercase codes are converted to uppercase."""
-        result = parse_and_validate_airports("kmco,kjfk")
-        assert result == ["KMCO", "KJFK"]
-
-    def test_whitespace_stripped(self):
-        """Test that whitespace is stripped."""
-        result = parse_and_validate_airports(" KMCO , KJFK ")
-        assert result == ["KMCO", "KJFK"]
-
-    def test_trailing_comma(self):
-        """Test handling of trailing comma."""
-        result = parse_and_validate_airports("KMCO,")
-        assert result == ["KMCO"]
-
-    def test_leading_comma(self):
-        """Test handling of leading comma."""
-        result = parse_and_validate_airports(",KMCO")
-        assert result == ["KMCO"]
-
-    def test_multiple_commas(self):
-        """Test handling of multiple commas."""
-        result = parse_and_validate_airports(",,,")
-        assert result == []
-
-    def test_invalid_length_too_short(self):
-        """Test that codes with length < 4 are skipped."""
-        result = parse_and_validate_airports("ABC,KMCO")
-        assert result == ["KMCO"]
-
-    def test_invalid_length_too_long(self):
-        """Test that codes with length > 4 are skipped."""
-        result = parse_and_validate_airports("ABCDE,KMCO")
-        assert result == ["KMCO"]
-
-    def test_all_invalid_codes(self):
-        """Test that all invalid codes results in empty list."""
-        result = parse_and_validate_airports("ABC,XY,TOOLONG")
-        assert result == []
-
-    def test_mixed_valid_invalid(self):
-        """Test mixed valid and invalid codes."""
-        result = parse_and_validate_airports("KMCO,ABC,KJFK,XY,KLAX")
-        assert result == ["KMCO", "KJFK", "KLAX"]
+    @pytest.mark.parametrize(
+        ("airports_str", "expected"),
+        [
+            pytest.param("KMCO", ["KMCO"], id="single"),
+            pytest.param("KMCO,KJFK,KLAX", ["KMCO", "KJFK", "KLAX"], id="multiple"),
+            pytest.param("kmco,kjfk", ["KMCO", "KJFK"], id="lowercase-converted"),
+            pytest.param(" KMCO , KJFK ", ["KMCO", "KJFK"], id="whitespace-stripped"),
+            pytest.param("KMCO,", ["KMCO"], id="trailing-comma"),
+            pytest.param(",KMCO", ["KMCO"], id="leading-comma"),
+            pytest.param(",,,", [], id="only-commas"),
+            pytest.param("ABC,KMCO", ["KMCO"], id="too-short-skipped"),
+            pytest.param("ABCDE,KMCO", ["KMCO"], id="too-long-skipped"),
+            pytest.param(
+                "KJ-K,K MC,KÉFK,00AK,KMCO", ["00AK", "KMCO"], id="invalid-characters-skipped"
+            ),
+            pytest.param("kmß,kmcſ,KMCO", ["KMCO"], id="non-ascii-skipped"),
+            pytest.param("ABC,XY,TOOLONG", [], id="all-invalid"),
+            pytest.param(
+                "KMCO,ABC,KJFK,XY,KLAX", ["KMCO", "KJFK", "KLAX"], id="mixed-valid-invalid"
+            ),
+        ],
+    )
+    def test_parse(self, airports_str, expected):
+        """Test that valid codes are uppercased and kept in order, and invalid ones skipped."""
+        assert parse_and_validate_airports(airports_str) == expected
+
+    @given(
+        codes=st.lists(st.from_regex(r"[A-Za-z0-9]{4}", fullmatch=True)),
+        separator=st.sampled_from([",", ", ", " , ", ",\t"]),
+    )
+    def test_valid_codes_round_trip(self, codes, separator):
+        """Test that any list of valid codes parses back to the same codes, uppercased."""
+        result = parse_and_validate_airports(separator.join(codes))
+        assert result == [code.upper() for code in codes]
+
+    @given(st.text())
+    def test_only_valid_codes_returned(self, airports_str):
+        """Test that arbitrary input only ever yields well-formed codes from the input."""
+        result = parse_and_validate_airports(airports_str)
+        for code in result:
+            assert len(code) == 4
+            assert code.isascii() and code.isalnum() and code == code.upper()
+            # Taken from an ASCII entry, so uppercasing can't have changed its length
+            assert code in {
+                token.strip().upper() for token in airports_str.split(",") if token.isascii()
+            }
 
 
 class TestGenerateDateRange:
@@ -140,3 +141,14 @@ class TestGenerateDateRange:
             date(2024, 2, 2),
         ]
         assert result == expected
+
+    def test_leap_year_range(self):
+        """Test generating a year-long range, checked day by day rather than literally."""
+        start = date(2024, 1, 1)
+        end = date(2024, 12, 31)
+        result = generate_date_range(start, end)
+        assert len(result) == 366
+        assert result[0] == start
+        assert result[-1] == end
+        assert all((later - earlier).days == 1 for earlier, later in pairwise(result))
+        assert date(2024, 2, 29) in result